@@ -47,7 +47,7 @@ class MapServicesQuery:
             else:
                 all_data_gdf = self._load_all_features_to_gdf()
                 with open(self.cache_location, 'wb') as outfile:
-                    pickle.dump(all_data_gdf, outfile)
+                    pickle.dump(all_data_gdf, outfile, protocol=pickle.HIGHEST_PROTOCOL)
         else:
             all_data_gdf = self._load_all_features_to_gdf()
 
@@ -108,7 +108,6 @@ class MapServicesQuery:
 
         input_url = self.url + where_query + self.standard_featureserver_query
         total_features_count = self._retrieve_max_features_count(input_url)
-        output_gdf = pd.DataFrame({})
         logger.info("Initiate downloading " + str(total_features_count) +
                     " of features.")
         
@@ -119,11 +118,11 @@ class MapServicesQuery:
             recordcount = 1000
 
         logger.info("Load data with api call: " + input_url)
-        for features_offset in range(0, total_features_count, recordcount):
-            temp_m_gdf = self._retrieve_batch_of_features_to_gdf(input_url, features_offset)
-            output_gdf = pd.concat([output_gdf, temp_m_gdf], ignore_index=True)
+        # The batches are combined once at the end, concatenating after every batch copies all previous batches again
+        batches = [self._retrieve_batch_of_features_to_gdf(input_url, features_offset)
+                   for features_offset in range(0, total_features_count, recordcount)]
 
-        return output_gdf
+        return pd.concat([pd.DataFrame({}), *batches], ignore_index=True)
 
     @staticmethod
     def _retrieve_max_features_count(input_url: str) -> int:
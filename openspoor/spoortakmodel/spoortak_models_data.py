@@ -1,9 +1,14 @@
+import hashlib
 import os
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from glob import glob
-from os.path import basename, join
+from os.path import basename, join, relpath
+import pickle
+from pathlib import Path
 
-import numpy as np
-from typing import Optional
+from typing import Callable, Optional
 import logging
 import pandas as pd
 
@@ -12,6 +17,32 @@ from openspoor.utils.singleton import Singleton
 log = logging.getLogger(__name__)
 
 
+class _LazyModels(Mapping):
+    """ Read-only mapping of model version to model that only reads and parses a model on first access """
+
+    def __init__(self, model_version_numbers: [int], load: Callable[[int], pd.DataFrame]):
+        """
+        :param model_version_numbers: the available model versions, these are the keys of the mapping
+        :param load: function that reads and parses the model of the given version
+        """
+        self._model_version_numbers = list(model_version_numbers)
+        self._load = load
+        self._cache = dict()
+
+    def __getitem__(self, model_version: int) -> pd.DataFrame:
+        if model_version not in self._cache:
+            if model_version not in self._model_version_numbers:
+                raise KeyError(model_version)
+            self._cache[model_version] = self._load(model_version)
+        return self._cache[model_version]
+
+    def __iter__(self):
+        return iter(self._model_version_numbers)
+
+    def __len__(self) -> int:
+        return len(self._model_version_numbers)
+
+
 class SpoortakModelsData(Singleton):
     """ Helper class that loads spoortak model data (only once)
 
@@ -19,21 +50,16 @@ class SpoortakModelsData(Singleton):
     - Support V18 (spoortak 2.0)
     """
 
-    models: dict = None
+    models: Mapping = None
     model_changes: dict = None
 
-    @staticmethod
-    def _convert_dutch_number(value: str) -> float:
-        """ '55.132,56' => 55132.56"""
-        if not value:
-            return np.nan
-        return float(value.replace('.', '').replace(',', '.'))
+    # Version of the layout of the cache file, bump this when the cached data changes
+    _CACHE_FORMAT = 1
 
     @staticmethod
-    def _km_to_meters(km: float) -> float:
-        if km is None or np.isnan(km):
-            return np.nan
-        return km * 1000.0
+    def _convert_dutch_km_to_meters(km: pd.Series) -> pd.Series:
+        """ '55.132,56' => 55132560.0, for a whole column of kilometers at once. Empty values become nan """
+        return pd.to_numeric(km.str.replace('.', '', regex=False).str.replace(',', '.', regex=False)) * 1000.0
 
     @staticmethod
     def _replace_km_columns(df: pd.DataFrame) -> None:
@@ -59,49 +85,126 @@ class SpoortakModelsData(Singleton):
 
         return [int(basename(directory).split('_')[1]) for directory in dirs]
 
-    def __init__(self, data_path: str):
+    @staticmethod
+    def _get_source_files(data_path: str) -> dict:
+        """ Return the modification time of every model file, to tell whether a cache is still up to date """
+        return {relpath(file, data_path): os.stat(file).st_mtime_ns
+                for file in sorted(glob(join(data_path, 'Versie_*', '*.csv')))}
+
+    @classmethod
+    def _get_cache_key(cls, data_path: str) -> dict:
+        """ Return everything the parsed models depend on, a cache is only used when this is unchanged """
+        return {'format': cls._CACHE_FORMAT,
+                'pandas': pd.__version__,
+                # the parsing code itself, so the models are parsed again after it changed
+                'parser': hashlib.sha256(Path(__file__).read_bytes()).hexdigest(),
+                'source_files': cls._get_source_files(data_path)}
+
+    def _load_cache(self, cache_location: Path, cache_key: dict) -> bool:
+        """ Load the models from the cache if it is readable and up to date
+
+        :return: whether the models were loaded from the cache
+        """
+        try:
+            with open(cache_location, 'rb') as infile:
+                cached = pickle.load(infile)
+            if cached['key'] != cache_key:
+                return False
+            model_version_numbers, models, model_changes = \
+                cached['model_version_numbers'], cached['models'], cached['model_changes']
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, KeyError, TypeError):
+            log.warning(f'Unable to read cache {cache_location}, the models are parsed again')
+            return False
+
+        log.info('loading data from cache...')
+        self.model_version_numbers = model_version_numbers
+        self.models = models
+        self.model_changes = model_changes
+        return True
+
+    def __init__(self, data_path: str, cache_location: Optional[Path] = None):
+        """
+        :param data_path: directory with a Versie_<number> directory for every spoortak model
+        :param cache_location: filepath where pickle file of the parsed models will be loaded from (or saved to if
+                file is absent, unreadable or out of date). The file is unpickled, so it should be in a directory
+                only the current user can write to
+        """
         # we've applied the singleton pattern here so we can check if the data is already there.
         if not self.models:
-            log.info('loading data...')
+            if not cache_location:
+                self._load(data_path)
+                return
+
+            cache_key = self._get_cache_key(data_path)
+            if os.path.exists(cache_location) and self._load_cache(cache_location, cache_key):
+                return
+
+            self._load(data_path)
+            # the cache holds every model, so all of them are parsed here
+            with ThreadPoolExecutor() as executor:
+                models = dict(zip(self.models, executor.map(self.models.__getitem__, self.models)))
+            # written next to the cache and then moved in place, so processes that load the data at the same
+            # time (e.g. pytest-xdist workers) never read a partially written cache
+            temporary_location = f'{cache_location}.{os.getpid()}'
+            try:
+                with open(temporary_location, 'wb') as outfile:
+                    pickle.dump({'key': cache_key,
+                                 'model_version_numbers': self.model_version_numbers,
+                                 'models': models,
+                                 'model_changes': self.model_changes}, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temporary_location, cache_location)
+            except Exception:
+                if os.path.exists(temporary_location):
+                    os.remove(temporary_location)
+                raise
 
-            self.models = dict()
+    def _load(self, data_path: str) -> None:
+        """ Find the supported models and read their changes, the models themselves are only parsed when used """
+        log.info('loading data...')
 
-            self.model_version_numbers = self._get_model_numbers(data_path)
-            unsupported_version_start = 18
-            self.model_version_numbers = [version for version in self.model_version_numbers if
-                                          version < unsupported_version_start]
+        self.model_version_numbers = self._get_model_numbers(data_path)
+        unsupported_version_start = 18
+        self.model_version_numbers = [version for version in self.model_version_numbers if
+                                      version < unsupported_version_start]
 
-            try:
-                for model_version in self.model_version_numbers:
-                    self.models[model_version] = pd.read_csv(os.path.join(data_path,
-                                                                          f'Versie_{model_version:02d}',
-                                                                          f'SPOORTAK_{model_version}.csv'),
-                                                             delimiter=';',
-                                                             header=0,
-                                                             converters={
-                                                                 'KM_BEGIN': lambda km: self._km_to_meters(
-                                                                     self._convert_dutch_number(km)),
-                                                                 'KM_EIND': lambda km: self._km_to_meters(
-                                                                     self._convert_dutch_number(km)),
-                                                                 'LENGTE': lambda km: self._km_to_meters(
-                                                                     self._convert_dutch_number(
-                                                                         km))
-                                                             },
-                                                             index_col='SPOORTAK_IDENTIFICATIE',
-                                                             encoding='latin1',
-                                                             )
-
-                    self._replace_km_columns(self.models[model_version])
-            except ValueError:
-                log.error(f'Failed to read model {model_version}')
-                raise
+        self.models = _LazyModels(self.model_version_numbers, partial(self._read_model, data_path))
 
-            self.model_changes = {
-                model_version: pd.read_csv(
-                    os.path.join(data_path, f'Versie_{model_version:02d}', f'BBMS_BERICHT_{model_version}.csv'),
-                    delimiter=';',
-                    header=0,
-                    encoding='latin1'
-                )
-                for model_version in self.model_version_numbers
-            }
+        # pandas releases the GIL while parsing, so the files are read in parallel
+        with ThreadPoolExecutor() as executor:
+            self.model_changes = dict(zip(self.model_version_numbers,
+                                          executor.map(partial(self._read_model_changes, data_path),
+                                                       self.model_version_numbers)))
+
+    @staticmethod
+    def _read_model_changes(data_path: str, model_version: int) -> pd.DataFrame:
+        """ Read the csv file with the changes of a single model """
+        return pd.read_csv(
+            os.path.join(data_path, f'Versie_{model_version:02d}', f'BBMS_BERICHT_{model_version}.csv'),
+            delimiter=';',
+            header=0,
+            encoding='latin1'
+        )
+
+    @classmethod
+    def _read_model(cls, data_path: str, model_version: int) -> pd.DataFrame:
+        """ Read and parse the csv file of a single model """
+        km_columns = ['KM_BEGIN', 'KM_EIND', 'LENGTE']
+        try:
+            # The Dutch formatted km columns are read as text and converted per column, which is much
+            # faster than converting every single value while parsing
+            model = pd.read_csv(os.path.join(data_path,
+                                             f'Versie_{model_version:02d}',
+                                             f'SPOORTAK_{model_version}.csv'),
+                                delimiter=';',
+                                header=0,
+                                dtype={column: object for column in km_columns},
+                                index_col='SPOORTAK_IDENTIFICATIE',
+                                encoding='latin1',
+                                )
+            for column in km_columns:
+                model[column] = cls._convert_dutch_km_to_meters(model[column])
+        except ValueError:
+            log.error(f'Failed to read model {model_version}')
+            raise
+        cls._replace_km_columns(model)
+        return model
@@ -1,17 +1,68 @@
 from __future__ import annotations
+import numpy as np
 import pandas as pd
 import folium
+import folium.plugins
+import xyzservices
 from loguru import logger
 
-from shapely.geometry import point, polygon, linestring, multilinestring
+from shapely.geometry import point
 import geopandas as gpd
+import shapely
 from typing import List, Optional, Dict, Tuple, Union
 from pathlib import Path
 from urllib.parse import quote
 from ..utils.common import read_config
 from abc import ABC, abstractmethod
+from functools import cached_property
 
 config = read_config()
+_DEFAULT_COLOR = config['default_color']
+_DEFAULT_MARKER = config['default_marker']
+_DEFAULT_RADIUS = config['default_radius']
+
+# Colors assigned to the unique values of a column, for markers and linestrings respectively
+_MARKER_COLORSET = ('purple', 'lightblue', 'darkgreen', 'blue', 'darkred', 'black',
+                    'pink', 'cadetblue', 'lightgray', 'lightred', 'green',
+                    'beige', 'darkblue', 'darkpurple', 'orange', 'lightgreen', 'red')
+_LINESTRING_COLORSET = ("black", "pink", "darkblue", "darkred", "gray", "green", "lightblue", "darkgreen", "lightgray",
+                        "lightgreen", "orange", "purple", "red", "beige")
+
+# Background layers of the aerial photograph. Folium elements belong to a single map and cannot be shared, but the
+# tile provider lookup that folium does for a named TileLayer dominates the cost of a TrackMap, so do it only once
+_AERIAL_WMS_URL = 'https://luchtfoto.prorail.nl/erdas-iws/ogc/wms/Luchtfoto'
+_AERIAL_WMS_LAYER = 'meest_recent'
+_OSM_TILES = xyzservices.providers.query_name('OpenStreetMap Mapnik')
+
+# Above this number of markers, markers that are close together are clustered by default
+_CLUSTER_THRESHOLD = 1000
+
+
+class _GeoJsonLayer(folium.GeoJson):
+    """
+    A folium GeoJson layer made from a GeoDataFrame, of which the bounds are determined in a vectorized way.
+    """
+
+    def __init__(self, data: gpd.GeoDataFrame, **kwargs):
+        """
+        :param data: The GeoDataFrame to show, its columns are used as properties of the features
+        :param kwargs: Passed on to folium.GeoJson
+        """
+        if data.crs != 'EPSG:4326':
+            data = data.to_crs('EPSG:4326')
+        self._total_bounds = data.total_bounds.tolist()
+        # folium embeds a GeoJSON dict as is, while a GeoDataFrame or JSON string would be serialized and parsed
+        # once more before the map is rendered
+        super().__init__(data=data.to_geo_dict(), **kwargs)
+
+    def get_bounds(self) -> List[List[float]]:
+        """
+        Compute the bounds of the layer, without folium looping over every coordinate in Python.
+
+        :return: The bounds as [[min_lat, min_lon], [max_lat, max_lon]]
+        """
+        min_lon, min_lat, max_lon, max_lat = self._total_bounds
+        return [[min_lat, min_lon], [max_lat, max_lon]]
 
 
 class PlotObject(ABC):
@@ -27,15 +78,56 @@ class PlotObject(ABC):
         else:
             TypeError('Unknown type for popup in linestrings')
 
-        if isinstance(data, gpd.GeoDataFrame):
-            self.data = data
-        elif isinstance(data, str):
-            self.data = gpd.read_file(data)
-        else:
+        if not isinstance(data, (gpd.GeoDataFrame, str)):
             raise TypeError('Provide either a geopandas dataframe or a file location of a csv to show')
-        self.data = self.data.to_crs('EPSG:4326')
+        self._data_source = data
+
+    def _load_source(self) -> gpd.GeoDataFrame:
+        """
+        Get the data as given, reading it first if a file location was given.
+
+        :return: A GeoDataFrame in its original crs
+        """
+        if isinstance(self._data_source, str):
+            # Parquet and feather files are read with Arrow, which is much faster than through GDAL
+            suffix = Path(self._data_source).suffix.lower()
+            if suffix in ('.parquet', '.geoparquet'):
+                return gpd.read_parquet(self._data_source)
+            if suffix == '.feather':
+                return gpd.read_feather(self._data_source)
+            return gpd.read_file(self._data_source)
+        return self._data_source
+
+    @cached_property
+    def data(self) -> gpd.GeoDataFrame:
+        """
+        The data to plot in EPSG:4326, with the popup columns as index. Files are only read and data is only
+        projected once this is first needed.
+
+        :return: A GeoDataFrame
+        """
+        data = self._load_source()
+        if data.crs is None:
+            raise ValueError("The data to plot has no crs, set it first with set_crs, e.g. set_crs('EPSG:28992')")
+        # Data given in RD need not be projected back from EPSG:4326 later on, see _geometry_rd
+        self._source_geometry_rd = data.geometry.values if data.crs == 'EPSG:28992' else None
+        if data.crs == 'EPSG:4326':
+            # No projection needed, but the implementation classes should not add columns to the input data
+            data = data.copy(deep=False)
+        else:
+            data = data.to_crs('EPSG:4326')
         if self.popup is not None:
-            self.data = self.data.set_index(self.popup)
+            data = data.set_index(self.popup)
+        return self._prepare_data(data)
+
+    def _prepare_data(self, data: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        """
+        Hook for implementation classes to add columns to the data once it is loaded.
+
+        :param data: The data in EPSG:4326, with the popup columns as index
+        :return: The data to plot
+        """
+        return data
 
     @abstractmethod
     def add_to(self, m) -> None:
@@ -47,6 +139,33 @@ class PlotObject(ABC):
         """
         raise NotImplementedError('This needs to be set in implementation classes')
 
+    @cached_property
+    def _geometry_rd(self) -> gpd.GeoSeries:
+        """
+        The geometry of the data in Rijksdriehoek coordinates (EPSG:28992), projected only once.
+
+        :return: A GeoSeries with the same index as self.data
+        """
+        data = self.data
+        if self._source_geometry_rd is not None:
+            return gpd.GeoSeries(self._source_geometry_rd, index=data.index, crs='EPSG:28992')
+        return data.geometry.to_crs('EPSG:28992')
+
+    def _in_viewport(self, folium_map) -> np.ndarray:
+        """
+        Determine which rows of the data intersect the viewport of the map. Maps without a viewport show everything.
+
+        :param folium_map: The map this object is added to
+        :return: A boolean array, True for every row of self.data that should be plotted
+        """
+        viewport_bbox = getattr(folium_map, 'viewport_bbox', None)
+        if viewport_bbox is None:
+            return np.ones(len(self.data), dtype=bool)
+
+        visible = np.zeros(len(self.data), dtype=bool)
+        visible[self.data.sindex.query(shapely.box(*viewport_bbox), predicate='intersects')] = True
+        return visible
+
 
 class TrackMap(folium.Map):
     """
@@ -57,17 +176,24 @@ class TrackMap(folium.Map):
     Maps can be shown directly, or saved as .html files.
     """
 
-    def __init__(self, objects: Union[PlotObject, List[PlotObject]] = [], add_aerial=True, **kwargs):
+    def __init__(self, objects: Union[PlotObject, List[PlotObject]] = [], add_aerial=True,
+                 viewport_bbox: Optional[Tuple[float, float, float, float]] = None, **kwargs):
         """
         Set up a TrackMap object.
 
         :param objects: A single plottable object or list of plottable objects that can be pre-defined 
         outside the context manager of the TrackMap
         :param add_aerial: Whether you want to include the ProRail aerial photograph or not
+        :param viewport_bbox: An optional (min_lon, min_lat, max_lon, max_lat) box. Only objects intersecting it are
+        added to the map, which keeps the output small for large datasets
+        :param kwargs: Passed on to folium.Map. By default, vector layers are drawn on a single canvas
+        (prefer_canvas=True), which only repaints what is in view and stays fast for large numbers of linestrings
         :return: A TrackMap object
         """
 
+        kwargs.setdefault('prefer_canvas', True)
         super().__init__(location=[52, 5], zoom_start=8, max_zoom=30, max_native_zoom=30, tiles=None, **kwargs)
+        self.viewport_bbox = viewport_bbox
         if add_aerial:
             self._add_aerial_photograph()
 
@@ -86,10 +212,13 @@ class TrackMap(folium.Map):
         :return: None
         """
         fg = folium.FeatureGroup(name=f"aerial_photograph", max_zoom=30, max_native_zoom=30)
-        folium.WmsTileLayer(url='https://luchtfoto.prorail.nl/erdas-iws/ogc/wms/Luchtfoto', layers='meest_recent',
+        # The WMS tiles are expensive to render server-side: keep more loaded tiles around when panning, and only
+        # request new tiles once zooming or panning has finished instead of for every intermediate view
+        folium.WmsTileLayer(url=_AERIAL_WMS_URL, layers=_AERIAL_WMS_LAYER,
                             transparent=True, overlay=False,
-                            maxZoom=30, maxNativeZoom=30).add_to(fg)
-        folium.TileLayer('openstreetmap', transparent=True, opacity=0.2).add_to(fg)
+                            maxZoom=30, maxNativeZoom=30,
+                            keepBuffer=4, updateWhenIdle=True, updateWhenZooming=False).add_to(fg)
+        folium.TileLayer(_OSM_TILES, name='openstreetmap', transparent=True, opacity=0.2).add_to(fg)
         self.add_child(fg)
 
     def _fix_zoom(self) -> None:
@@ -102,17 +231,16 @@ class TrackMap(folium.Map):
         bboxes = []
 
         for _, item in self._children.items():
-            if isinstance(item, folium.features.Choropleth):  # For linestrings
-                bboxes.extend(feature['bbox'][::-1] for feature in item.geojson.data['features'])
-            if isinstance(item, folium.features.GeoJson):  # For linestrings and areas
+            # For points, linestrings and areas, and points that are clustered
+            if isinstance(item, (folium.features.GeoJson, folium.plugins.MarkerCluster)):
                 bboxes.append([i for coords in item.get_bounds() for i in coords])
             if isinstance(item, folium.map.Marker):  # For markers
-                bboxes.append(item.location * 2)  # Min and max bound are equal for points, hence the repeat
+                bboxes.append(item.location * 2)  # Min and max bound are both the point location
 
         if bboxes:  # Fit only if there are some items to show
-            bounds = [min(map(lambda x: x[i], bboxes)) if i < 2 else max(map(lambda x: x[i], bboxes)) for i in range(4)]
+            bboxes = np.asarray(bboxes, dtype=float)
             # Convert into [[min_lat, min_lon], [max_lat, max_lon]]
-            self.fit_bounds([bounds[:2], bounds[2:]])
+            self.fit_bounds([bboxes[:, :2].min(axis=0).tolist(), bboxes[:, 2:].max(axis=0).tolist()])
 
     def add(self, plotobject) -> TrackMap:
         plotobject.add_to(self)
@@ -154,7 +282,8 @@ class PlottingPoints(PlotObject):
                  lat_column: Optional[str] = 'lat', lon_column: Optional[str] = 'lon',
                  colors: Union[str, Tuple[str, Dict[Tuple[float, float]]]] = None,
                  markertype: Optional[str] = None, marker_column: str = None, color_column: str = None,
-                 rotation_column: str = None, radius_column: str = None, url_column: str = None):
+                 rotation_column: str = None, radius_column: str = None, url_column: str = None,
+                 cluster: Optional[bool] = None):
         """
         Initialize a PlottingPoints object, used for plotting a list of markers on a map of the Netherlands.
 
@@ -167,10 +296,14 @@ class PlottingPoints(PlotObject):
         :param markertype: 'circle' if circles are required, or an icon name found in
         # https://fontawesome.com/v4/icons/
         :param marker_column: A column including the names of the markers to display
-        :param color_column: A column that can be  used for the colors of the markers
+        :param color_column: A column that can be  used for the colors of the markers. Every unique value gets its own
+        color, in order of appearance. Grouping is much faster for a column with a pandas categorical dtype
         :param rotation_column: A column noting the degrees of rotation in the range (0,360)
         :param radius_column: A column noting the radius of the circles to plot (if markertype=='circle')
         :param url_column: A column including an url that is displayed in the popup
+        :param cluster: Whether to group markers that are close together into clusters. By default, markers are
+        clustered when there are more than 1000 of them, which keeps maps with many markers responsive. Circles are
+        never clustered
         """
 
         # Do some pre-processing for the cases the data is not a GeoDataFrame
@@ -185,18 +318,11 @@ class PlottingPoints(PlotObject):
             data[rotation_column + '_for_plotting'] = data[rotation_column]
         self.color_column = color_column
         if self.color_column is not None:
+            # For categorical columns, factorize reuses the existing codes instead of hashing all values
             data[self.color_column + "_factorized"] = pd.factorize(data[self.color_column])[0]
 
         super().__init__(data, popup)
 
-        if isinstance(data, gpd.GeoDataFrame):
-            if isinstance(data.geometry.iloc[0], point.Point):
-                data = data.to_crs('EPSG:4326')
-                self.data['lat'] = data.geometry.apply(lambda d: d.y)
-                self.data['lon'] = data.geometry.apply(lambda d: d.x)
-            else:
-                NotImplementedError(f"Unimplemented geometry: {data.geometry.iloc[0]}")
-
         # TODO: Automatically do this by looping through args?
         self.markertype = markertype
         self.colors = colors
@@ -204,77 +330,123 @@ class PlottingPoints(PlotObject):
         self.rotation = rotation_column
         self.radius = radius_column
         self.url_column = url_column
-
-    def _get_marker_color(self, row):
-            if self.color_column is not None:
-                colorset = ['purple', 'lightblue', 'darkgreen', 'blue', 'darkred', 'black',
-                            'pink', 'cadetblue', 'lightgray', 'lightred', 'green',
-                            'beige', 'darkblue', 'darkpurple', 'orange', 'lightgreen', 'red']
-                return colorset[int(row[self.color_column + "_factorized"]) % len(colorset)]
-            
-            if self.colors is None:
-                return config['default_color']
-
-            if isinstance(self.colors, str):
-                return self.colors
-            
-            column, colormap = self.colors
-            for bounds, color in colormap.items():
-                if min(bounds) <= row[column] < max(bounds):
-                    return color
-            
-    def _get_popup_text(self, i, row):
-        if isinstance(i, tuple):
-            indexnames = i
+        self.cluster = cluster
+
+    def _prepare_data(self, data: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        # The data is already in EPSG:4326, so no further projection is needed
+        if isinstance(data.geometry.iloc[0], point.Point):
+            coordinates = shapely.get_coordinates(data.geometry.values)
+            data['lat'] = coordinates[:, 1]
+            data['lon'] = coordinates[:, 0]
         else:
-            indexnames = (i,)
-        if self.popup:
-            popup_text = ''
-            for indexvalue, col in zip(indexnames, self.popup):
-                if col == self.url_column:
-                    url = quote(row[col], safe='/:?=&')  # Replaces characters unsuitable for URL's
-                    popup_text = popup_text + f"{col}: <a href={url}>Hyperlink</a><br>",
-                else:
-                    popup_text = popup_text + f'{col}: {indexvalue}<br>'
-            return popup_text
+            NotImplementedError(f"Unimplemented geometry: {data.geometry.iloc[0]}")
+        return data
+
+    @cached_property
+    def marker_colors(self) -> np.ndarray:
+        """
+        Determine the color of every marker at once, so every map the points are added to reuses them.
+
+        :return: An array with the color of every point in self.data
+        """
+        if self.color_column is not None:
+            color_index = self.data[self.color_column + "_factorized"].to_numpy()
+            return np.take(np.array(_MARKER_COLORSET, dtype=object), color_index % len(_MARKER_COLORSET))
+
+        if self.colors is None:
+            return np.full(len(self.data), _DEFAULT_COLOR, dtype=object)
+
+        if isinstance(self.colors, str):
+            return np.full(len(self.data), self.colors, dtype=object)
+
+        column, colormap = self.colors
+        lower_bounds = np.array([min(bounds) for bounds in colormap], dtype=float)
+        upper_bounds = np.array([max(bounds) for bounds in colormap], dtype=float)
+        # Values outside of all bounds get no color (None), which is stored as the last entry
+        colorset = np.array([*colormap.values(), None], dtype=object)
+        values = self.data[column].to_numpy(dtype=float)
+
+        order = np.argsort(lower_bounds, kind='stable')
+        if np.all(upper_bounds[order][:-1] <= lower_bounds[order][1:]):
+            # Without overlapping bounds, a binary search finds the only bounds a value can be in
+            candidate = order[np.maximum(np.searchsorted(lower_bounds[order], values, side='right') - 1, 0)]
+            in_bounds = (lower_bounds[candidate] <= values) & (values < upper_bounds[candidate])
+            color_index = np.where(in_bounds, candidate, len(colormap))
         else:
+            # Compare the values with one set of bounds at a time, without an array of all values times all bounds.
+            # Going in reverse order, the first matching bounds determine the color
+            color_index = np.full(len(values), len(colormap))
+            for i in range(len(colormap) - 1, -1, -1):
+                color_index[(lower_bounds[i] <= values) & (values < upper_bounds[i])] = i
+        return colorset[color_index]
+
+    @cached_property
+    def popup_text(self) -> Optional[np.ndarray]:
+        """
+        Build the popup texts of all points at once, based on the popup columns in the index of self.data.
+
+        :return: An array with the popup text of every point, or None if no popup is requested
+        """
+        if not self.popup:
             return None
+        popup_text = np.full(len(self.data), '', dtype=object)
+        for col in self.popup:
+            values = self.data.index.get_level_values(col).astype(str)
+            if col == self.url_column:
+                # Replaces characters unsuitable for URL's, quoting every distinct url only once
+                codes, unique_urls = pd.factorize(values)
+                urls = np.array([quote(url, safe='/:?=&') for url in unique_urls], dtype=object)[codes]
+                popup_text = popup_text + f"{col}: <a href=" + urls + ">Hyperlink</a><br>"
+            else:
+                popup_text = popup_text + f'{col}: ' + values.to_numpy(dtype=object) + '<br>'
+        return popup_text
 
     def add_to(self, folium_map):
-        for i, row in self.data.iterrows():
+        visible = self._in_viewport(folium_map)
+        if not visible.any():
+            return folium_map
+        data = self.data[visible]
 
-            location = row.geometry.y, row.geometry.x
+        # All points are drawn in a single layer, instead of a folium element to render for every point. The style
+        # of every point is stored in its properties, named after the Leaflet option it sets
+        points = gpd.GeoDataFrame(geometry=data.geometry.values, crs=data.crs)
+        colors = self.marker_colors[visible]
 
+        if self.markertype == 'circle':
+            marker = folium.Circle(fill=False)
+            points['color'] = colors
+            points['radius'] = data[self.radius].to_numpy() if self.radius is not None else _DEFAULT_RADIUS
+        else:
+            marker = folium.Marker(icon=folium.Icon(prefix='fa'))
+            points['markerColor'] = colors
             if self.rotation is not None:
-                rotation = int(row[self.rotation + '_for_plotting'])
-                marker = 'arrow-up'
+                points['icon'] = 'arrow-up'
+                rotations = data[self.rotation + '_for_plotting'].to_numpy().astype(int).astype(str)
+                points['extraClasses'] = np.char.add('fa-rotate-', rotations)
             else:
-                rotation = 0
-
                 if self.marker is not None:
-                    marker = row[self.marker]
-                elif self.markertype is not None:
-                    marker = self.markertype
+                    points['icon'] = data[self.marker].to_numpy()
                 else:
-                    marker = config['default_marker']
+                    points['icon'] = self.markertype if self.markertype is not None else _DEFAULT_MARKER
+                points['extraClasses'] = 'fa-rotate-0'
 
-            if self.markertype == 'circle':
-                if self.radius is not None:
-                    radius = row[self.radius]
-                else:
-                    radius = config['default_radius']
-                folium.Circle(
-                    radius=radius,
-                    location=location,
-                    popup=self._get_popup_text(i, row),
-                    color=self._get_marker_color(row),
-                    fill=False,
-                ).add_to(folium_map)
-            else:
-                folium.Marker(location,
-                              popup=self._get_popup_text(i, row),
-                              icon=folium.Icon(color=self._get_marker_color(row), prefix='fa', icon=marker, angle=rotation)).add_to(
-                    folium_map)
+        popup = None
+        if self.popup_text is not None:
+            points['popup'] = self.popup_text[visible]
+            popup = folium.GeoJsonPopup(fields=['popup'], labels=False)
+
+        cluster = len(points) > _CLUSTER_THRESHOLD if self.cluster is None else self.cluster
+        if cluster and self.markertype != 'circle':
+            parent = folium.plugins.MarkerCluster(control=False).add_to(folium_map)
+        else:
+            parent = folium_map
+
+        # Points without a color keep the default color of the marker
+        _GeoJsonLayer(data=points,
+                      marker=marker,
+                      style_function=lambda x: {key: value for key, value in x['properties'].items()
+                                                if key != 'popup' and value is not None},
+                      popup=popup).add_to(parent)
         return folium_map
 
 
@@ -293,7 +465,8 @@ class PlottingLineStrings(PlotObject):
         :param data: A geopandas dataframe or a file location of a csv file
         :param popup: The column(s) whose values are shown when hovering over a linestring
         :param color: The color in which the linestrings should be shown on the map
-        :param buffersize: The size of the buffer around the linestrings on the map
+        :param buffersize: The size of the buffer around the linestrings on the map, in which the popup is
+        shown when hovering
         """
 
         data = data.copy()
@@ -308,6 +481,18 @@ class PlottingLineStrings(PlotObject):
         
         super().__init__(data, popup)
 
+    @cached_property
+    def _hover_geometry_rd(self) -> np.ndarray:
+        """
+        The buffered linestrings in which the popup is shown, in Rijksdriehoek coordinates. These are computed only
+        once, also when the linestrings are added to several maps.
+
+        :return: An array with the buffered geometry of every row in self.data
+        """
+        # Details smaller than the buffer are invisible in the hover layer, so simplify the lines before buffering
+        simplified = shapely.simplify(self._geometry_rd.values, self.buffersize / 2)
+        return shapely.buffer(simplified, self.buffersize)
+
     def _make_tooltip(self):
         return folium.features.GeoJsonTooltip(
             fields=self.popup,
@@ -323,8 +508,7 @@ class PlottingLineStrings(PlotObject):
         :return: The updated map
         """
         if 'color_by_column' in self.data.columns:
-            colors = ["black", "pink", "darkblue", "darkred", "gray", "green", "lightblue", "darkgreen", "lightgray",
-                        "lightgreen", "orange", "purple", "red", "beige"]
+            colors = _LINESTRING_COLORSET
                                     
             if self.data['color_by_column'].nunique() > len(colors):
                 logger.warning("More groups than colors, some groups will have the same color")
@@ -336,33 +520,41 @@ class PlottingLineStrings(PlotObject):
                     dict(zip(self.data['color_by_column'].unique(), colors * 100))
                 )
 
-            for color, group in self.data.reset_index().groupby('color_by_column'):
-                to_plot = PlottingLineStrings(group.drop(['color_by_column'], axis=1), popup=self.popup, color=color, buffersize=self.buffersize)
-                to_plot.add_to(folium_map)
+        visible = self._in_viewport(folium_map)
+        if not visible.any():
+            return folium_map
+        data = self.data[visible]
+
+        if 'color_by_column' in data.columns:
+            # All groups are drawn in a single layer, with the color of every line read from its properties
+            _GeoJsonLayer(
+                data=data[['color_by_column', 'geometry']].reset_index(drop=True),
+                style_function=lambda x: {'color': x['properties']['color_by_column'], 'weight': 3},
+                control=False,
+            ).add_to(folium_map)
+        else:
+            _GeoJsonLayer(
+                data=data[['geometry']].reset_index(drop=True),
+                style_function=lambda x: {'color': self.color, 'weight': 3},
+                control=False,
+            ).add_to(folium_map)
+
+        # Add hover functionality. Without a popup there is no tooltip to show, so no hover layer is needed
+        if not self.popup:
             return folium_map
-
-        folium.Choropleth(
-            self.data['geometry'],
-            line_weight=3,
-            line_color=self.color,
-        ).add_to(folium_map)
-
-        # Add hover functionality.
         style_function = lambda x: {'fillColor': '#ffffff', 'color': '#000000', 'fillOpacity': 0.1, 'weight': 0.1}
         highlight_function = lambda x: {'fillColor': '#000000', 'color': '#000000', 'fillOpacity': 0.50, 'weight': 0.1}
 
-        if self.popup:
-            tooltip = self._make_tooltip()
-        else:
-            tooltip = None
+        # Only the popup columns in the index are needed for the tooltip, so the other columns are not copied
+        hover_data = gpd.GeoDataFrame(geometry=self._hover_geometry_rd[visible],
+                                      index=data.index, crs=self._geometry_rd.crs).reset_index()
 
-        sectie_hover = folium.features.GeoJson(
-            data=self.data.assign(
-                geometry=lambda x: x.geometry.to_crs('EPSG:28992').buffer(self.buffersize)).reset_index(),
+        sectie_hover = _GeoJsonLayer(
+            data=hover_data,
             style_function=style_function,
             control=False,
             highlight_function=highlight_function,
-            tooltip=tooltip
+            tooltip=self._make_tooltip()
         )
         folium_map.add_child(sectie_hover)
         folium_map.keep_in_front(sectie_hover)
@@ -393,6 +585,22 @@ class PlottingAreas(PlotObject):
         self.color = color
         self.stroke = stroke
 
+    @cached_property
+    def popup_text(self) -> Optional[np.ndarray]:
+        """
+        Build the popup texts of all areas at once, based on the popup columns in the index of self.data.
+
+        :return: An array with the popup text of every area, or None if no popup is requested
+        """
+        if not self.popup:
+            return None
+        popup_texts = [f'{col}: ' + self.data.index.get_level_values(col).astype(str).to_numpy(dtype=object)
+                       for col in self.popup]
+        popup_text = popup_texts[0]
+        for text in popup_texts[1:]:
+            popup_text = popup_text + '<br>' + text
+        return popup_text
+
     def add_to(self, folium_map: TrackMap) -> TrackMap:
         """
         Add the areas to a TrackMap object
@@ -400,24 +608,31 @@ class PlottingAreas(PlotObject):
         :param folium_map: The map to add the objects to
         :return: The updated map
         """
-        if self.popup:
-            indexnames = self.data.index.names
+        visible = self._in_viewport(folium_map)
+        if not visible.any():
+            return folium_map
 
-        for index, r in self.data.iterrows():
-            sim_geo = gpd.GeoSeries(r['geometry']).simplify(tolerance=0.00001)
-            geo_j = sim_geo.to_json()
-            geo_j = folium.GeoJson(data=geo_j,
-                                   style_function=lambda x: {'fillColor': self.color,
-                                                             'stroke': self.stroke})
+        # All areas are simplified and serialized at once, and shown as a single layer
+        areas = gpd.GeoDataFrame(geometry=shapely.simplify(self.data.geometry.values[visible], tolerance=0.00001),
+                                 crs=self.data.crs)
+        popup = None
+        if self.popup_text is not None:
+            areas['popup'] = self.popup_text[visible]
+            popup = folium.GeoJsonPopup(fields=['popup'], labels=False)
+
+        _GeoJsonLayer(data=areas,
+                      style_function=lambda x: {'fillColor': self.color, 'stroke': self.stroke},
+                      popup=popup).add_to(folium_map)
+        return folium_map
 
-            if self.popup:
-                if not isinstance(index, tuple):
-                    index = (index,)
-                popupname = '<br>'.join([': '.join([str(i), str(j)]) for i, j in list(zip(indexnames, index))])
 
-                folium.Popup(popupname).add_to(geo_j)
-            folium_map.add_child(geo_j)
-        return folium_map
+# The plottable object used for every type of geometry
+_PLOT_CLASSES = {
+    'POINT': PlottingPoints,
+    'LINESTRING': PlottingLineStrings,
+    'MULTILINESTRING': PlottingLineStrings,
+    'POLYGON': PlottingAreas,
+}
 
 
 def plottable(data: Union[gpd.GeoDataFrame, pd.DataFrame, PlotObject], popup=None, *args, **kwargs) -> PlotObject:
@@ -432,15 +647,17 @@ def plottable(data: Union[gpd.GeoDataFrame, pd.DataFrame, PlotObject], popup=Non
     if isinstance(data, PlotObject):  # Objects that are already plottable
         return data
     if isinstance(data, gpd.GeoDataFrame):
-        firstentry = data.geometry.values[0]
-        if isinstance(firstentry, polygon.Polygon):
-            return PlottingAreas(data, popup, *args, **kwargs)
-        elif isinstance(firstentry, linestring.LineString) or isinstance(firstentry, multilinestring.MultiLineString):
-            return PlottingLineStrings(data, popup, *args, **kwargs)
-        elif isinstance(firstentry, point.Point):
-            return PlottingPoints(data, popup, *args, **kwargs)
-        else:
-            NotImplementedError(f'GeoDataFrame with entries of type {type(firstentry)} not supported yet')
+        type_ids = np.unique(shapely.get_type_id(data.geometry.values))
+        # Missing geometries have type id -1, these are simply not shown
+        geometry_types = [shapely.GeometryType(type_id).name for type_id in type_ids[type_ids >= 0]]
+        if not geometry_types:
+            raise ValueError('GeoDataFrame without geometries can not be plotted')
+        plot_classes = {_PLOT_CLASSES.get(geometry_type) for geometry_type in geometry_types}
+        if None in plot_classes:
+            raise NotImplementedError(f'GeoDataFrame with entries of type(s) {geometry_types} not supported yet')
+        if len(plot_classes) > 1:
+            raise ValueError(f'GeoDataFrame with mixed geometry types {geometry_types} can not be plotted at once')
+        return plot_classes.pop()(data, popup, *args, **kwargs)
     elif isinstance(data, pd.DataFrame):  # Whenever data is a dataframe, it is probably points
         logger.info('Interpreting data as dataframe')
         return PlottingPoints(data, popup, *args, **kwargs)
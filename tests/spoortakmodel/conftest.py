@@ -0,0 +1,18 @@
+import pathlib
+
+import pytest
+
+from openspoor.spoortakmodel import SpoortakModelsData
+
+MODELS_DATA_DIR = str(pathlib.Path(__file__).parents[2].joinpath('data').resolve())
+
+
+@pytest.fixture(scope='class')
+def spoortak_models_data(request):
+    """ Load the models once and share them with all tests of a test class as models_data, from models_data_dir """
+    # The parsed models are cached between test runs in the pytest cache directory of the project, and are parsed
+    # again once the model files change
+    cache = getattr(request.config, 'cache', None)
+    cache_location = cache.mkdir('spoortak_models') / 'models.pkl' if cache else None
+    request.cls.models_data_dir = MODELS_DATA_DIR
+    request.cls.models_data = SpoortakModelsData(MODELS_DATA_DIR, cache_location)
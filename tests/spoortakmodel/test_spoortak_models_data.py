@@ -1,12 +1,14 @@
 import os
 import pathlib
+import pickle
+import tempfile
 import unittest
+from unittest.mock import patch
 from parameterized import parameterized
 import pytest
 
 from openspoor.spoortakmodel import SpoortakModelsData
-
-MODELS_DATA_DIR = str(pathlib.Path(__file__).parents[2].resolve().joinpath('data').resolve())
+from openspoor.utils.singleton import Singleton
 
 
 def _test_model_name(func, param_num, param):
@@ -14,29 +16,29 @@ def _test_model_name(func, param_num, param):
     return f'{func.__name__}_model_v{param.args[0]}'
 
 
+@pytest.mark.usefixtures('spoortak_models_data')
 class TestSpoortakModelsData(unittest.TestCase):
-
     def test_data_dir_exists(self):
         """ Test that the data directory exists and is accesable"""
-        self.assertTrue(os.path.exists(MODELS_DATA_DIR), f'{MODELS_DATA_DIR} does not exist')
+        self.assertTrue(os.path.exists(self.models_data_dir), f'{self.models_data_dir} does not exist')
 
     def test_basic_load_test(self):
-        sut = SpoortakModelsData(MODELS_DATA_DIR)
+        sut = self.models_data
 
         self.assertGreaterEqual(15, len(sut.models))
         self.assertGreaterEqual(15, len(sut.model_changes))
 
     def test_data_unique_spoortak(self):
         """ This is a data integrity test"""
-        sut = SpoortakModelsData(MODELS_DATA_DIR)
-        self.assertFalse(any(any(model.index.duplicated()) for model in sut.models.values()))
+        sut = self.models_data
+        self.assertTrue(all(model.index.is_unique for model in sut.models.values()))
 
     @parameterized.expand(
         [(3, 13163), (4, 13145), (5, 12952), (6, 12937), (7, 12867), (8, 12662), (9, 12528), (10, 12443), (11, 12390),
          (12, 12256),
          (13, 12217), (14, 12153), (15, 12057), (16, 11935), (17, 11906)], name_func=_test_model_name)
     def test_rows_loaded(self, model, row_count):
-        sut = SpoortakModelsData(MODELS_DATA_DIR)
+        sut = self.models_data
         self.assertEqual(len(sut.models[model]), row_count, f'model {model} has {len(sut.models[model])} rows')
 
     @parameterized.expand(
@@ -48,8 +50,78 @@ class TestSpoortakModelsData(unittest.TestCase):
                     'SUBCODE_EIND', 'NAAM_GEOCODE_EIND', 'NR_EIND', 'KANTCODE_EIND',
                     'NR_SUB', 'LENGTE', 'OBEGINTIJD', 'BEHEERDER', 'LENGTE_GEOM',
                     'kilometrering_start', 'kilometrering_end']
-        sut = SpoortakModelsData(MODELS_DATA_DIR)
+        sut = self.models_data
         self.assertCountEqual(sut.models[model].columns, expected,
                               f'model {model} has {len(sut.models[model].columns)} columns')
 
-#
+
+class TestSpoortakModelsDataCache(unittest.TestCase):
+    """ Uses a small model of its own, and a fresh SpoortakModelsData instead of the shared singleton """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.data_path = pathlib.Path(directory.name)
+        self.cache_location = self.data_path / 'models.pkl'
+        model_dir = self.data_path / 'Versie_03'
+        model_dir.mkdir()
+        (model_dir / 'SPOORTAK_3.csv').write_text(
+            'SPOORTAK_IDENTIFICATIE;KM_BEGIN;KM_EIND;LENGTE;GEOCODE_BEGIN;GEOCODE_EIND\n'
+            'S1;1,5;1.000,25;998,75;1;1\n', encoding='latin1')
+        (model_dir / 'BBMS_BERICHT_3.csv').write_text('ID;TYPE\n1;RENAME\n', encoding='latin1')
+
+        singletons = patch.object(Singleton, '_instances', {})
+        singletons.start()
+        self.addCleanup(singletons.stop)
+
+    def _load(self) -> SpoortakModelsData:
+        Singleton._instances.clear()
+        return SpoortakModelsData(str(self.data_path), self.cache_location)
+
+    def test_cache_is_used(self):
+        self._load()
+        with open(self.cache_location, 'rb') as infile:
+            cached = pickle.load(infile)
+        cached['models'][3]['kilometrering_start'] = -1.0
+        with open(self.cache_location, 'wb') as outfile:
+            pickle.dump(cached, outfile)
+
+        self.assertEqual(-1.0, self._load().models[3].loc['S1', 'kilometrering_start'])
+
+    def test_outdated_cache_is_ignored(self):
+        self._load()
+        with open(self.cache_location, 'rb') as infile:
+            cached = pickle.load(infile)
+        cached['models'][3]['kilometrering_start'] = -1.0
+        cached['key']['pandas'] = '0.0.0'
+        with open(self.cache_location, 'wb') as outfile:
+            pickle.dump(cached, outfile)
+
+        self.assertEqual(1500.0, self._load().models[3].loc['S1', 'kilometrering_start'])
+
+    def test_unreadable_cache_is_ignored(self):
+        self.cache_location.write_bytes(b'not a pickle')
+
+        sut = self._load()
+
+        self.assertEqual(1500.0, sut.models[3].loc['S1', 'kilometrering_start'])
+        self.assertEqual(1000250.0, sut.models[3].loc['S1', 'kilometrering_end'])
+        # the unreadable cache is replaced
+        with open(self.cache_location, 'rb') as infile:
+            self.assertEqual([3], pickle.load(infile)['model_version_numbers'])
+
+    def test_no_cache(self):
+        with patch.object(SpoortakModelsData, '_get_cache_key') as get_cache_key:
+            Singleton._instances.clear()
+            sut = SpoortakModelsData(str(self.data_path))
+
+        get_cache_key.assert_not_called()
+        self.assertEqual(1500.0, sut.models[3].loc['S1', 'kilometrering_start'])
+        self.assertFalse(self.cache_location.exists())
+
+    def test_failed_cache_write_is_cleaned_up(self):
+        with patch('pickle.dump', side_effect=pickle.PicklingError('unable to pickle')):
+            with self.assertRaises(pickle.PicklingError):
+                self._load()
+
+        self.assertEqual(['Versie_03'], os.listdir(self.data_path))
@@ -84,3 +84,17 @@ class Test:
             ]
         )
         pd.testing.assert_frame_equal(output_data, expected_output)
+
+    def test_load_all_features_in_batches(self, monkeypatch):
+        mapservices_data = MapServicesQuery(url="")
+        monkeypatch.setattr(MapServicesQuery, '_retrieve_max_features_count', lambda self, url: 2500)
+        monkeypatch.setattr(MapServicesQuery, '_get_max_recordcount', lambda self, url: 1000)
+        monkeypatch.setattr(MapServicesQuery, '_retrieve_batch_of_features_to_gdf',
+                            lambda self, url, offset: gpd.GeoDataFrame({"offset": [offset, offset + 1]},
+                                                                       geometry=[Point(offset, 0), Point(offset, 1)]))
+
+        output_data = mapservices_data._load_all_features_to_gdf()
+
+        assert isinstance(output_data, gpd.GeoDataFrame)
+        assert output_data["offset"].tolist() == [0, 1, 1000, 1001, 2000, 2001]
+        assert output_data.index.tolist() == list(range(6))
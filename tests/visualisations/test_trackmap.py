@@ -1,13 +1,17 @@
 import os
+from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
 import geopandas as gpd
 import pytest
-from openspoor.visualisations.trackmap import TrackMap, PlottingPoints, PlottingLineStrings, PlottingAreas, plottable
+from openspoor.visualisations.trackmap import TrackMap, PlottingPoints, PlottingLineStrings, PlottingAreas, plottable, \
+    _GeoJsonLayer
 
 from shapely.geometry import Point, LineString, Polygon
-from shapely import wkt
+import shapely
 import folium
+import folium.plugins
 
 
 @pytest.fixture(scope='session')
@@ -31,8 +35,15 @@ def test_TrackMap(base_trackmap, prefilled_trackmap, example_plottingdataframe):
     objects_in_base_trackmap = len(base_trackmap._children)
     objects_in_prefilled_trackmap = len(prefilled_trackmap._children)
     assert objects_in_base_trackmap == 1, 'Should contain only the aerial photo'
-    assert objects_in_prefilled_trackmap == 1 + len(
-        example_plottingdataframe.data), 'Should contain the aerial photo and some markers'
+    assert objects_in_prefilled_trackmap == 2, 'Should contain the aerial photo and a layer of markers'
+
+
+def point_layers(m):
+    return [child for child in m._children.values() if isinstance(child, folium.GeoJson) and child.marker is not None]
+
+
+def point_styles(m):
+    return [layer.style_function(feature) for layer in point_layers(m) for feature in layer.data['features']]
 
 
 @pytest.fixture
@@ -56,7 +67,7 @@ def lines_geodataframe():
         pd.DataFrame(data={'name': ['Q', 'R', 'S'],
                            'name2': ['QQ', 'RR', 'SS'],
                            'geometry': [line1, line2, line3]})
-        .assign(geometry=lambda d: d.geometry.apply(wkt.loads))
+        .assign(geometry=lambda d: shapely.from_wkt(d.geometry.to_numpy()))
         .pipe(gpd.GeoDataFrame, geometry='geometry', crs='EPSG:4326')
         .assign(geometry=lambda d: d.geometry.to_crs('EPSG:4326'))
     )
@@ -73,7 +84,7 @@ def areas_geodataframe():
         pd.DataFrame(data={'name': ['M', 'N', 'O', 'P'],
                            'name2': ['MM', 'NN', 'OO', 'PP'],
                            'geometry': [area1, area2, area3, area4]})
-        .assign(geometry=lambda d: d.geometry.apply(wkt.loads))
+        .assign(geometry=lambda d: shapely.from_wkt(d.geometry.to_numpy()))
         .pipe(gpd.GeoDataFrame, geometry='geometry', crs='EPSG:4326')
         .assign(geometry=lambda d: d.geometry.to_crs('EPSG:4326'))
     )
@@ -87,12 +98,14 @@ def test_add_to_trackmap(tmp_path, add_aerial, points_dataframe, lines_geodatafr
     PlottingLineStrings(lines_geodataframe, popup=['name2']).add_to(m)
     PlottingAreas(areas_geodataframe, popup=['name2']).add_to(m)
 
-    # For the points and areas, 1 child is added for every row in the dataframe
     # 1 child always exists when the aerial photograph is added
     aerial_photograph_children = add_aerial
     # Linestrings always add 2 objects; one for the hover, and one for the lines themselves
     linestring_children = 2
-    total_objects = len(points_dataframe) + linestring_children + len(areas_geodataframe) + aerial_photograph_children
+    # All points and all areas are added as a single object
+    point_children = 1
+    area_children = 1
+    total_objects = point_children + linestring_children + area_children + aerial_photograph_children
 
     assert len(m._children) == total_objects, "Invalid number of items added"
 
@@ -124,19 +137,161 @@ def test_add_to_trackmap(tmp_path, add_aerial, points_dataframe, lines_geodatafr
         assert type(m_child) == type(r_child), 'Unequal type'
 
 
+def test_linestrings_color_column(lines_geodataframe):
+    m = TrackMap(add_aerial=False)
+    PlottingLineStrings(lines_geodataframe.assign(group=['a', 'b', 'a']), popup=['name'], color='group').add_to(m)
+
+    # Lines of every color end up in a single layer, next to the layer used for hovering
+    assert len(m._children) == 2, "Invalid number of items added"
+    lines = next(child for child in m._children.values() if isinstance(child, folium.features.GeoJson))
+    linecolors = [lines.style_function(feature)['color'] for feature in lines.data['features']]
+    assert linecolors == ['black', 'pink', 'black'], 'Incorrect colors for linestrings'
+
+
+def test_linestrings_without_popup(lines_geodataframe):
+    # Without a popup, no hover layer is added next to the lines
+    m = TrackMap(add_aerial=False)
+    PlottingLineStrings(lines_geodataframe).add_to(m)
+    assert len(m._children) == 1, "Invalid number of items added"
+
+
+def test_geometry_rd(lines_geodataframe):
+    lines_rd = lines_geodataframe.to_crs('EPSG:28992')
+    for lines in (lines_geodataframe, lines_rd):
+        geometry_rd = PlottingLineStrings(lines, popup='name')._geometry_rd
+        assert list(geometry_rd.index) == list(lines['name']), 'Index differs from the data'
+        assert shapely.equals_exact(geometry_rd.values, lines_rd.geometry.values, tolerance=1e-6).all(), \
+            'Incorrect geometry'
+
+    lines = PlottingLineStrings(lines_rd, popup='name')
+    with patch.object(lines, '_load_source', wraps=lines._load_source) as load_source:
+        lines._geometry_rd
+    assert load_source.call_count == 1, 'Data loaded more than once'
+
+
 def test_plottingpoint_settings(points_dataframe, tmp_path):
     m = TrackMap()
     PlottingPoints(points_dataframe, popup=['name', 'name2'], rotation_column='lat').add_to(m)
     PlottingPoints(points_dataframe, popup=['name', 'name2'], marker_column='marker').add_to(m)
     PlottingPoints(points_dataframe, popup=['name', 'name2'], markertype='train').add_to(m)
     PlottingPoints(points_dataframe, popup=['name', 'name2'], markertype='circle', radius_column='lat').add_to(m)
-    markers_added = len([child for child in m._children if child.split('_')[0] == 'marker'])
-    circles_added = len([child for child in m._children if child.split('_')[0] == 'circle'])
+    layers = point_layers(m)
+    assert [type(layer.marker) for layer in layers] == 3 * [folium.Marker] + [folium.Circle], 'Unexpected markers'
+    assert all(len(layer.data['features']) == len(points_dataframe) for layer in layers), 'Unexpected amount of points'
+
+    styles = point_styles(m)
+    assert [style['extraClasses'] for style in styles[:4]] == ['fa-rotate-52'] * 4, 'Incorrect rotation'
+    assert [style['icon'] for style in styles[4:8]] == list(points_dataframe['marker']), 'Incorrect markers'
+    assert [style['icon'] for style in styles[8:12]] == ['train'] * 4, 'Incorrect markers'
+    assert [style['radius'] for style in styles[12:]] == list(points_dataframe['lat']), 'Incorrect radii'
+
+
+def test_cluster(points_dataframe):
+    m = TrackMap(add_aerial=False)
+    PlottingPoints(points_dataframe, cluster=True).add_to(m)
+    PlottingPoints(points_dataframe, markertype='circle', cluster=True).add_to(m)
+    clusters = [child for child in m._children.values() if isinstance(child, folium.plugins.MarkerCluster)]
+    assert len(clusters) == 1, 'Only markers should be clustered'
+    assert len(point_layers(clusters[0])) == 1, 'Markers not added to the cluster'
+
+    m.show()
+    fit_bounds = next(child for child in m._children.values() if child._name == 'FitBounds')
+    assert fit_bounds.bounds == [[52.45, 5.15], [52.6, 5.4]], 'Clustered markers not taken into account for zoom'
+
+
+def test_points_coordinates(points_dataframe):
+    points = PlottingPoints(points_dataframe, popup='name')
+    assert list(points.data['lat']) == list(points_dataframe['lat']), 'Incorrect latitudes'
+    assert list(points.data['lon']) == list(points_dataframe['lon']), 'Incorrect longitudes'
+
+
+def test_popup_text(points_dataframe):
+    points = PlottingPoints(points_dataframe.assign(url='https://www.prorail.nl/a b'),
+                            popup=['name', 'url'], url_column='url')
+    assert list(points.popup_text) == [
+        f'name: {name}<br>url: <a href=https://www.prorail.nl/a%20b>Hyperlink</a><br>' for name in 'ABCD'
+    ], 'Incorrect popup text'
+    assert PlottingPoints(points_dataframe).popup_text is None, 'Popup text without popup columns'
+
+
+def test_viewport_bbox(points_dataframe, lines_geodataframe, areas_geodataframe):
+    # Only the first two points, the first and third line and the first area intersect this box
+    m = TrackMap(add_aerial=False, viewport_bbox=(4.85, 52.0, 5.25, 52.52))
+    PlottingPoints(points_dataframe, popup=['name']).add_to(m)
+    PlottingLineStrings(lines_geodataframe.iloc[[1]], popup=['name']).add_to(m)
+    PlottingAreas(areas_geodataframe, popup=['name']).add_to(m)
 
-    num_expected_markers = 3 * len(points_dataframe)
-    num_expected_circles = 1 * len(points_dataframe)
-    assert num_expected_markers == markers_added, 'Unexpected amount of objects'
-    assert num_expected_circles == circles_added, 'Unexpected amount of objects'
+    points = point_layers(m)[0]
+    assert [feature['geometry']['coordinates'] for feature in points.data['features']] == \
+        [(5.15, 52.45), (5.2, 52.5)], 'Unexpected markers plotted'
+    assert len(m._children) == 1 + 2 + 1, 'Unexpected amount of objects'
+
+    # Lines outside of the viewport are not plotted at all
+    m = TrackMap(add_aerial=False, viewport_bbox=(6.0, 53.0, 6.1, 53.1))
+    PlottingLineStrings(lines_geodataframe, popup=['name']).add_to(m)
+    assert len(m._children) == 0, 'Unexpected amount of objects'
+
+
+def test_prefer_canvas():
+    assert TrackMap().options['prefer_canvas'], 'Vector layers should be drawn on a canvas by default'
+    assert not TrackMap(prefer_canvas=False).options['prefer_canvas'], 'Unable to overwrite the renderer'
+
+
+def test_area_popup_text(areas_geodataframe):
+    areas = PlottingAreas(areas_geodataframe, popup=['name', 'name2'])
+    assert list(areas.popup_text) == [f'name: {name}<br>name2: {name * 2}' for name in 'MNOP'], 'Incorrect popup text'
+    assert PlottingAreas(areas_geodataframe).popup_text is None, 'Popup text without popup columns'
+
+
+def test_geojson_layer_bounds(areas_geodataframe):
+    layer = _GeoJsonLayer(areas_geodataframe.to_crs('EPSG:28992'))
+    expected = folium.GeoJson(areas_geodataframe).get_bounds()
+    assert np.allclose(layer.get_bounds(), expected), 'Incorrect bounds'
+
+
+def test_lazy_data(areas_geodataframe, tmp_path):
+    areas_geodataframe.to_file(tmp_path / 'areas.geojson')
+    areas = PlottingAreas(str(tmp_path / 'areas.geojson'), popup='name')
+    assert 'data' not in vars(areas), 'File was read before plotting'
+
+    m = TrackMap(add_aerial=False)
+    areas.add_to(m)
+    assert len(m._children) == 1, 'Unexpected amount of objects'
+    assert list(areas.data.index) == list(areas_geodataframe['name']), 'Popup columns not set as index'
+
+
+
+@pytest.mark.parametrize('filename, write', [('areas.parquet', gpd.GeoDataFrame.to_parquet),
+                                             ('areas.feather', gpd.GeoDataFrame.to_feather)])
+def test_arrow_files(areas_geodataframe, tmp_path, filename, write):
+    pytest.importorskip('pyarrow')
+    write(areas_geodataframe, tmp_path / filename)
+    areas = PlottingAreas(str(tmp_path / filename), popup='name')
+    assert list(areas.data.index) == list(areas_geodataframe['name']), 'Arrow file not read'
+
+
+def test_missing_crs(areas_geodataframe):
+    areas = PlottingAreas(areas_geodataframe.set_crs(None, allow_override=True))
+    with pytest.raises(ValueError, match='set_crs'):
+        areas.data
+
+
+def test_plottable(points_dataframe, lines_geodataframe, areas_geodataframe):
+    assert isinstance(plottable(points_dataframe), PlottingPoints)
+    assert isinstance(plottable(lines_geodataframe), PlottingLineStrings)
+    assert isinstance(plottable(areas_geodataframe), PlottingAreas)
+
+    with pytest.raises(ValueError):
+        plottable(pd.concat([lines_geodataframe, areas_geodataframe]))
+    with pytest.raises(NotImplementedError):
+        plottable(areas_geodataframe.assign(geometry=lambda d: d.geometry.exterior))
+
+    # Missing geometries are left out when inferring the type
+    lines_with_missing = lines_geodataframe.copy()
+    lines_with_missing.loc[lines_with_missing.index[0], 'geometry'] = None
+    assert isinstance(plottable(lines_with_missing), PlottingLineStrings)
+    with pytest.raises(ValueError, match='without geometries'):
+        plottable(lines_geodataframe.iloc[:0])
 
 
 def test_fix_zoom(prefilled_trackmap):
@@ -174,12 +329,7 @@ def test_colors(points_dataframe):
     m = TrackMap()
     PlottingPoints(points_dataframe, color_column='value').add_to(m)
 
-    markercolors = []
-    for _, child in m._children.items():
-        if isinstance(child, folium.map.Marker):
-            for _, grandchild in child._children.items():
-                print(grandchild.options)
-                markercolors.append(grandchild.options['marker_color'])
+    markercolors = [style['markerColor'] for style in point_styles(m)]
     assert markercolors == ['purple', 'lightblue', 'darkgreen', 'blue'], 'Incorrect colors for points'
 
     # Create map with colors based on numeric values in a given column
@@ -187,9 +337,17 @@ def test_colors(points_dataframe):
     PlottingPoints(points_dataframe,
                    colors=('value', {(-1, 2.0): 'green', (2.0, 3.5): 'orange', (3.5, 10): 'red'})).add_to(q)
 
-    markercolors = []
-    for _, child in q._children.items():
-        if isinstance(child, folium.map.Marker):
-            for _, grandchild in child._children.items():
-                markercolors.append(grandchild.options['marker_color'])
+    markercolors = [style['markerColor'] for style in point_styles(q)]
     assert markercolors == ['green', 'orange', 'orange', 'red'], 'Incorrect colors for points'
+
+
+@pytest.mark.parametrize("colormap, expected", [
+    # Bounds are given in arbitrary order and direction
+    ({(3.5, 10): 'red', (2.0, -1): 'green', (2.0, 3.5): 'orange'}, [None, 'green', 'orange', 'red', None]),
+    # With overlapping bounds, the first matching bounds determine the color
+    ({(3.5, 10): 'red', (-1, 2.5): 'green', (2.0, 3.5): 'orange'}, [None, 'green', 'green', 'red', None]),
+])
+def test_colormap_bounds(colormap, expected):
+    points = PlottingPoints({'lat': [52.45] * 5, 'lon': [5.15] * 5, 'value': [-5, 1.9, 2.0, 9.99, 10]},
+                            colors=('value', colormap))
+    assert list(points.marker_colors) == expected, 'Incorrect colors for points'